@@ -1,119 +1,177 @@
 import os
+import hashlib
 import math
-import re
+import mmap
+import pickle
 import sqlite3
-from collections import defaultdict
+import threading
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
 from pathlib import Path
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_from_directory
+from flask.json.provider import JSONProvider
+import orjson
 import requests
 
+from people_terms import TERM_CHARS, build_people_automaton, fold_text, unfold_offset
+
 # Configuration
 MODEL = os.environ.get("OPENAI_MODEL", "gpt-4o-mini")
 API_KEY = os.environ.get("OPENAI_API_KEY")
 PORT = int(os.environ.get("PORT", "8000"))
+OPENAI_CHAT_URL = "https://api.openai.com/v1/chat/completions"
+SUMMARY_BATCH_WORKERS = int(os.environ.get("SUMMARY_BATCH_WORKERS", "8"))
+SUMMARY_BATCH_MAX_ENTRIES = 50
+SUMMARY_CACHE_SIZE = 1024
 SITE_DIR = os.path.join(os.path.dirname(__file__), "site")
 DIARY_DIR = os.path.join(os.path.dirname(__file__), "diary_by_date")
 PEOPLE_DB_PATH = os.environ.get(
     "PEPYS_DB_PATH",
     os.path.join(os.path.dirname(__file__), "people.sqlite"),
 )
+PEOPLE_AUTOMATON_PATH = os.environ.get(
+    "PEPYS_AUTOMATON_PATH",
+    os.path.join(os.path.dirname(__file__), "people.ac"),
+)
 
 if not API_KEY:
     raise SystemExit("OPENAI_API_KEY is required in the environment")
 
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson, keeping sorted keys like the default."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__, static_folder=SITE_DIR, static_url_path="")
+app.json = OrjsonProvider(app)
+
+# Shared session so OpenAI calls reuse pooled keep-alive connections
+# instead of paying a TCP + TLS handshake per summary.
+openai_session = requests.Session()
+# Room for every gthread worker thread plus the batch pool to hold a
+# connection without the pool discarding them.
+openai_session.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=32))
+openai_session.headers.update(
+    {
+        "Authorization": f"Bearer {API_KEY}",
+        "Content-Type": "application/json",
+    }
+)
+# Bounds how many OpenAI calls /summarize_batch keeps in flight at once.
+summary_executor = ThreadPoolExecutor(max_workers=SUMMARY_BATCH_WORKERS)
 
+# (text, mode) -> summary, least recently used first. Shared by the plain,
+# batch and streaming endpoints; failed calls are never stored.
+summary_cache: OrderedDict[tuple[str, str], str] = OrderedDict()
+summary_cache_lock = threading.Lock()
 
-def word_count(text: str) -> int:
-    return len([w for w in text.split() if w])
 
+def cached_summary(text: str, mode: str) -> str | None:
+    with summary_cache_lock:
+        summary = summary_cache.get((text, mode))
+        if summary is not None:
+            summary_cache.move_to_end((text, mode))
+        return summary
 
-TERM_BOUNDARY_PREFIX = r"(?<![A-Za-z0-9])"
-TERM_BOUNDARY_SUFFIX = r"(?![A-Za-z0-9])"
 
+def remember_summary(text: str, mode: str, summary: str) -> None:
+    with summary_cache_lock:
+        summary_cache[(text, mode)] = summary
+        summary_cache.move_to_end((text, mode))
+        while len(summary_cache) > SUMMARY_CACHE_SIZE:
+            summary_cache.popitem(last=False)
 
-def build_term_pattern(term: str) -> re.Pattern:
-    escaped = re.escape(term.strip())
-    escaped = escaped.replace(r"\ ", r"\s+")
-    return re.compile(
-        rf"{TERM_BOUNDARY_PREFIX}{escaped}{TERM_BOUNDARY_SUFFIX}",
-        re.IGNORECASE,
+
+def word_count(text: str) -> int:
+    return len([w for w in text.split() if w])
+
+
+def stale_people_db_message(exc: sqlite3.OperationalError) -> str:
+    # Databases built before the people_terms table existed fail here.
+    return (
+        f"People database {PEOPLE_DB_PATH} is out of date ({exc}); "
+        "re-run init_people_db.py to rebuild it"
     )
 
 
 @lru_cache(maxsize=2)
-def load_people_terms(db_path: str):
+def load_people_automaton(db_path: str, automaton_path: str):
+    """Load the precompiled people automaton, rebuilding it if stale or absent."""
     if not os.path.exists(db_path):
         raise FileNotFoundError(f"Missing people database at {db_path}")
-    conn = sqlite3.connect(db_path)
-    try:
-        rows = conn.execute(
-            """
-            SELECT p.id, p.name, p.note, p.name AS term
-            FROM people p
-            UNION ALL
-            SELECT p.id, p.name, p.note, a.alias AS term
-            FROM person_aliases a
-            JOIN people p ON p.id = a.person_id
-            """
-        ).fetchall()
-    finally:
-        conn.close()
-
-    terms = []
-    seen = set()
-    for person_id, person_name, person_note, term in rows:
-        if not term:
-            continue
-        cleaned = term.strip()
-        if not cleaned:
-            continue
-        key = (person_id, cleaned.lower())
-        if key in seen:
-            continue
-        seen.add(key)
-        terms.append(
-            {
-                "person_id": int(person_id),
-                "name": person_name,
-                "note": person_note,
-                "term": cleaned,
-                "pattern": build_term_pattern(cleaned),
-            }
-        )
-    return terms
+    if (
+        os.path.exists(automaton_path)
+        and os.path.getmtime(automaton_path) >= os.path.getmtime(db_path)
+    ):
+        with open(automaton_path, "rb") as fh:
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return pickle.loads(mm)
+    return build_people_automaton(db_path)
+
+
+@lru_cache(maxsize=2048)
+def load_diary_body(date: str) -> str:
+    """Return the entry text for a date with its header line stripped."""
+    path = Path(DIARY_DIR) / f"{date}.txt"
+    if not path.exists():
+        raise FileNotFoundError(f"Unknown date: {date}")
+
+    text = path.read_text(encoding="utf-8")
+    lines = text.splitlines()
+    if lines and lines[0].strip() == date:
+        lines = lines[1:]
+    while lines and not lines[0].strip():
+        lines = lines[1:]
+    return "\n".join(lines)
 
 
 def entities_for_text(text: str, limit: int = 10):
     if not text.strip():
         return {"entities": [], "matches": []}
 
-    terms = load_people_terms(PEOPLE_DB_PATH)
+    automaton = load_people_automaton(PEOPLE_DB_PATH, PEOPLE_AUTOMATON_PATH)
+    if not len(automaton):
+        return {"entities": [], "matches": []}
+
+    folded, folded_starts, shifts = fold_text(text)
     raw_matches = []
-    for term in terms:
-        for match in term["pattern"].finditer(text):
-            raw_matches.append(
-                {
-                    "start": match.start(),
-                    "end": match.end(),
-                    "person_id": term["person_id"],
-                    "name": term["name"],
-                    "note": term["note"],
-                }
-            )
+    for folded_end, (term_len, terms) in automaton.iter(folded):
+        start = unfold_offset(folded_end - term_len + 1, folded_starts, shifts)
+        end = unfold_offset(folded_end, folded_starts, shifts) + 1
+        if start > 0 and text[start - 1] in TERM_CHARS:
+            continue
+        if end < len(text) and text[end] in TERM_CHARS:
+            continue
+        # Terms sharing a span always overlap each other, so only the first
+        # can survive overlap resolution.
+        raw_matches.append((start, end, terms[0]))
 
     if not raw_matches:
         return {"entities": [], "matches": []}
 
-    raw_matches.sort(key=lambda m: (m["start"], -(m["end"] - m["start"])))
+    raw_matches.sort(key=lambda m: (m[0], m[0] - m[1]))
     matches = []
     cursor = -1
-    for match in raw_matches:
-        if match["start"] < cursor:
+    for start, end, term in raw_matches:
+        if start < cursor:
             continue
-        matches.append(match)
-        cursor = match["end"]
+        matches.append(
+            {
+                "start": start,
+                "end": end,
+                "person_id": term.person_id,
+                "name": term.name,
+                "note": term.note,
+            }
+        )
+        cursor = end
 
     counts = defaultdict(int)
     people = {}
@@ -161,6 +219,15 @@ def entities_for_text(text: str, limit: int = 10):
     return {"entities": entities, "matches": matches}
 
 
+@lru_cache(maxsize=4096)
+def entities_payload(date: str, limit: int):
+    """Serialized /entities response for a date plus its ETag."""
+    data = entities_for_text(load_diary_body(date), limit=limit)
+    payload = orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+    etag = hashlib.blake2b(payload, digest_size=8).hexdigest()
+    return payload, etag
+
+
 def limit_for_mode(mode: str, text: str) -> int:
     mode = mode or "w100"
     if mode == "w10":
@@ -173,25 +240,72 @@ def limit_for_mode(mode: str, text: str) -> int:
     return 100
 
 
-def summarize_with_openai(text: str, mode: str) -> str:
+def summary_request(text: str, mode: str) -> dict:
     limit = limit_for_mode(mode, text)
     prompt = (
         f"Summarize this 17th-century diary entry in at most {limit} words. "
         f"Preserve key events, names, and places. If fewer words suffice, be concise.\n\n"
         f"Entry:\n{text}"
     )
+    return {
+        "model": MODEL,
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": 0.3,
+    }
+
+
+def sse_event(data: dict, event: str = "") -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {orjson.dumps(data).decode('utf-8')}\n\n"
+
+
+def stream_summary_with_openai(text: str, mode: str):
+    """Yield server-sent events carrying summary deltas as OpenAI emits them."""
+    summary = cached_summary(text, mode)
+    if summary is not None:
+        yield sse_event({"delta": summary})
+        yield sse_event({}, event="done")
+        return
+
+    deltas = []
+    try:
+        with openai_session.post(
+            OPENAI_CHAT_URL,
+            json={**summary_request(text, mode), "stream": True},
+            timeout=30,
+            stream=True,
+        ) as resp:
+            if not resp.ok:
+                raise RuntimeError(f"Upstream error {resp.status_code}: {resp.text}")
+            for line in resp.iter_lines():
+                if not line.startswith(b"data: "):
+                    continue
+                data = line[len(b"data: "):]
+                if data == b"[DONE]":
+                    break
+                choices = orjson.loads(data).get("choices") or [{}]
+                delta = choices[0].get("delta", {}).get("content")
+                if delta:
+                    deltas.append(delta)
+                    yield sse_event({"delta": delta})
+    except Exception as e:  # noqa: BLE001
+        app.logger.exception("Streaming summarize failed")
+        yield sse_event({"error": str(e)}, event="error")
+        return
+    summary = "".join(deltas).strip()
+    if summary:
+        remember_summary(text, mode, summary)
+    yield sse_event({}, event="done")
+
 
-    resp = requests.post(
-        "https://api.openai.com/v1/chat/completions",
-        headers={
-            "Authorization": f"Bearer {API_KEY}",
-            "Content-Type": "application/json",
-        },
-        json={
-            "model": MODEL,
-            "messages": [{"role": "user", "content": prompt}],
-            "temperature": 0.3,
-        },
+def summarize_with_openai(text: str, mode: str) -> str:
+    summary = cached_summary(text, mode)
+    if summary is not None:
+        return summary
+
+    resp = openai_session.post(
+        OPENAI_CHAT_URL,
+        json=summary_request(text, mode),
         timeout=30,
     )
     if not resp.ok:
@@ -205,6 +319,7 @@ def summarize_with_openai(text: str, mode: str) -> str:
     )
     if not summary:
         raise RuntimeError("No summary returned")
+    remember_summary(text, mode, summary)
     return summary
 
 
@@ -228,6 +343,54 @@ def summarize():
         return jsonify({"error": str(e)}), 500
 
 
+@app.route("/summarize_stream", methods=["POST"])
+def summarize_stream():
+    payload = request.get_json(force=True, silent=True) or {}
+    if not isinstance(payload, dict):
+        return jsonify({"error": "Expected a JSON object"}), 400
+    text = (payload.get("text") or "").strip()
+    mode = payload.get("mode") or "w100"
+    if not text:
+        return jsonify({"error": "Missing text"}), 400
+    return Response(
+        stream_summary_with_openai(text, mode),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.route("/summarize_batch", methods=["POST"])
+def summarize_batch():
+    payload = request.get_json(force=True, silent=True) or {}
+    if not isinstance(payload, dict):
+        return jsonify({"error": "Expected a JSON object"}), 400
+    entries = payload.get("entries")
+    default_mode = payload.get("mode") or "w100"
+    if not isinstance(entries, list) or not entries:
+        return jsonify({"error": "Missing entries"}), 400
+    if len(entries) > SUMMARY_BATCH_MAX_ENTRIES:
+        return (
+            jsonify({"error": f"At most {SUMMARY_BATCH_MAX_ENTRIES} entries per batch"}),
+            400,
+        )
+
+    def summarize_entry(entry):
+        if not isinstance(entry, dict):
+            return {"error": "Invalid entry"}
+        text = (entry.get("text") or "").strip()
+        mode = entry.get("mode") or default_mode
+        if not text:
+            return {"error": "Missing text"}
+        try:
+            return {"summary": summarize_with_openai(text, mode)}
+        except Exception as e:  # noqa: BLE001
+            app.logger.exception("Batch summarize failed")
+            return {"error": str(e)}
+
+    results = list(summary_executor.map(summarize_entry, entries))
+    return jsonify({"results": results})
+
+
 @app.route("/entities")
 def entities():
     date = (request.args.get("date") or "").strip()
@@ -241,24 +404,21 @@ def entities():
         limit = 10
     limit = max(1, min(limit, 50))
 
-    path = Path(DIARY_DIR) / f"{date}.txt"
-    if not path.exists():
+    try:
+        load_diary_body(date)
+    except FileNotFoundError:
         return jsonify({"error": f"Unknown date: {date}"}), 404
 
-    text = path.read_text(encoding="utf-8")
-    lines = text.splitlines()
-    if lines and lines[0].strip() == date:
-        lines = lines[1:]
-    while lines and not lines[0].strip():
-        lines = lines[1:]
-    body = "\n".join(lines)
-
     try:
-        data = entities_for_text(body, limit=limit)
+        payload, etag = entities_payload(date, limit)
     except FileNotFoundError as exc:
         return jsonify({"error": str(exc)}), 500
+    except sqlite3.OperationalError as exc:
+        return jsonify({"error": stale_people_db_message(exc)}), 500
 
-    return jsonify(data)
+    resp = app.response_class(payload, mimetype="application/json")
+    resp.set_etag(etag)
+    return resp.make_conditional(request)
 
 
 # Static file fallback
@@ -267,5 +427,15 @@ def static_proxy(path: str):
     return send_from_directory(SITE_DIR, path)
 
 
+# Load the people matcher at import so the first /entities request does not
+# pay for it (and a preloading server shares it with its workers).
+try:
+    load_people_automaton(PEOPLE_DB_PATH, PEOPLE_AUTOMATON_PATH)
+except FileNotFoundError as exc:
+    app.logger.warning("People matcher not preloaded: %s", exc)
+except sqlite3.OperationalError as exc:
+    app.logger.warning("People matcher not preloaded: %s", stale_people_db_message(exc))
+
+
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=PORT, debug=False)
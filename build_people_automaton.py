@@ -0,0 +1,21 @@
+import pickle
+from pathlib import Path
+
+from people_terms import build_people_automaton
+
+DB_PATH = Path("people.sqlite")
+OUTPUT_PATH = Path("people.ac")
+
+
+def main():
+    if not DB_PATH.exists():
+        raise SystemExit(f"Missing people database: {DB_PATH}")
+
+    automaton = build_people_automaton(str(DB_PATH))
+    with OUTPUT_PATH.open("wb") as fh:
+        pickle.dump(automaton, fh, protocol=pickle.HIGHEST_PROTOCOL)
+    print(f"Wrote {OUTPUT_PATH} with {len(automaton)} terms from {DB_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,9 +13,12 @@
           python = pkgs.python3;
           pythonEnv = python.withPackages (ps: with ps; [
             flask
+            gunicorn
             ipython
             tiktoken
+            orjson
             pikepdf
+            pyahocorasick
             pypdf
             requests
           ]);
@@ -0,0 +1,11 @@
+import multiprocessing
+import os
+
+# Threaded workers keep serving while summaries wait on OpenAI; preloading
+# loads the people matcher once and shares it with every worker.
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", "16"))
+timeout = 60
+preload_app = True
@@ -71,31 +71,24 @@ def main():
     conn.execute("PRAGMA foreign_keys = ON;")
     conn.executescript(SCHEMA_PATH.read_text(encoding="utf-8"))
 
+    # Resolve person ids from in-memory indexes instead of a SELECT per row.
+    person_ids: dict[tuple[str, Optional[str]], int] = {}
+    first_person_ids: dict[str, int] = {}
+    for row_id, row_name, row_note in conn.execute(
+        "SELECT id, normalized_name, note FROM people ORDER BY id"
+    ):
+        person_ids.setdefault((row_name, row_note), int(row_id))
+        first_person_ids.setdefault(row_name, int(row_id))
+    alias_rows = []
+
     def find_person_id(
         normalized_name: str,
         note: Optional[str],
         allow_any_note: bool = False,
     ) -> Optional[int]:
         if allow_any_note:
-            cur = conn.execute(
-                "SELECT id FROM people WHERE normalized_name = ? ORDER BY id LIMIT 1",
-                (normalized_name,),
-            )
-            row = cur.fetchone()
-            return int(row[0]) if row else None
-        if note is None:
-            cur = conn.execute(
-                "SELECT id FROM people WHERE normalized_name = ? AND note IS NULL ORDER BY id LIMIT 1",
-                (normalized_name,),
-            )
-            row = cur.fetchone()
-            return int(row[0]) if row else None
-        cur = conn.execute(
-            "SELECT id FROM people WHERE normalized_name = ? AND note = ? ORDER BY id LIMIT 1",
-            (normalized_name, note),
-        )
-        row = cur.fetchone()
-        return int(row[0]) if row else None
+            return first_person_ids.get(normalized_name)
+        return person_ids.get((normalized_name, note))
 
     def upsert_person(
         name: str,
@@ -113,7 +106,10 @@ def main():
         )
         if cur.lastrowid is None:
             raise RuntimeError("Failed to insert person")
-        return int(cur.lastrowid)
+        person_id = int(cur.lastrowid)
+        person_ids.setdefault((normalized_name, note), person_id)
+        first_person_ids.setdefault(normalized_name, person_id)
+        return person_id
 
     def add_alias(
         person_id: int,
@@ -124,14 +120,7 @@ def main():
         normalized_alias = normalize(alias)
         if not normalized_alias:
             return
-        conn.execute(
-            """
-            INSERT OR IGNORE INTO person_aliases
-              (person_id, alias, normalized_alias, note, source)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (person_id, alias, normalized_alias, note, source),
-        )
+        alias_rows.append((person_id, alias, normalized_alias, note, source))
 
     text = PERSONS_PATH.read_text(encoding="utf-8")
     for name_part, note in parse_people_lines(text):
@@ -156,6 +145,34 @@ def main():
         for alias in aliases:
             add_alias(person_id, alias)
 
+    conn.executemany(
+        """
+        INSERT OR IGNORE INTO person_aliases
+          (person_id, alias, normalized_alias, note, source)
+        VALUES (?, ?, ?, ?, ?)
+        """,
+        alias_rows,
+    )
+
+    conn.execute("DELETE FROM people_terms")
+    conn.execute(
+        """
+        INSERT INTO people_terms (person_id, name, note, term)
+        SELECT person_id, name, note, term
+        FROM (
+          SELECT p.id AS person_id, p.name, p.note, p.name AS term,
+                 0 AS source_order, p.id AS row_order
+          FROM people p
+          UNION ALL
+          SELECT p.id, p.name, p.note, a.alias, 1, a.id
+          FROM person_aliases a
+          JOIN people p ON p.id = a.person_id
+        )
+        WHERE term IS NOT NULL
+        ORDER BY source_order, row_order
+        """
+    )
+
     conn.commit()
     conn.close()
     print(f"Initialized {DB_PATH} with people + aliases from {PERSONS_PATH}")
@@ -13,16 +13,18 @@ in
     buildPhase = ''
       runHook preBuild
       ${pythonEnv}/bin/python init_people_db.py
+      ${pythonEnv}/bin/python build_people_automaton.py
       runHook postBuild
     '';
     installPhase = ''
       runHook preInstall
       install -d $out/share/pepys
-      cp -r site diary_by_date app.py $out/share/pepys/
+      cp -r site diary_by_date app.py people_terms.py gunicorn_conf.py $out/share/pepys/
       install -m 0644 people.sqlite $out/share/pepys/people.sqlite
-      makeWrapper ${pythonEnv}/bin/python $out/bin/pepys-server \
+      install -m 0644 people.ac $out/share/pepys/people.ac
+      makeWrapper ${pythonEnv}/bin/gunicorn $out/bin/pepys-server \
         --chdir $out/share/pepys \
-        --add-flags app.py
+        --add-flags "-c gunicorn_conf.py app:app"
       runHook postInstall
     '';
   };
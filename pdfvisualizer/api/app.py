@@ -1,15 +1,33 @@
 import mimetypes
 import os
+import shutil
 import uuid
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
+from typing import Any, Iterator
+from urllib.parse import unquote
 
-from flask import Flask, jsonify, request, send_file, send_from_directory
+import orjson
+from flask import Flask, Response, jsonify, request, send_file, send_from_directory
 from werkzeug.utils import secure_filename
 
-from parser import object_detail, parse_pdf
+from parser import (
+    close_cached_pdf,
+    content_stream_stats,
+    object_detail,
+    object_details,
+    parse_pdf,
+    search_text,
+    xref_table,
+)
 from storage import Storage
 
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+SEARCH_RESULT_LIMIT = 200
+MAX_BATCH_OBJECTS = 200
+STREAM_BATCH_ITEMS = 256
+
 
 def _max_upload_bytes() -> int:
     max_mb = os.environ.get("PDFVIZ_MAX_MB", "100")
@@ -23,6 +41,7 @@ def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+@lru_cache(maxsize=4096)
 def _normalize_obj_id(value: str) -> str:
     cleaned = value.strip()
     if cleaned.lower().endswith(" r"):
@@ -45,6 +64,27 @@ def _int_arg(name: str, default: int = 0) -> int:
         return default
 
 
+def _stream_json(fields: dict[str, Any], lists: dict[str, list]) -> Iterator[bytes]:
+    """Yield one JSON object: the scalar fields, then each list in batches.
+
+    Lets large arrays start reaching the client before the whole document is
+    serialized, and keeps only one batch of encoded items in memory.
+    """
+    head = orjson.dumps(fields)
+    yield head[:-1]
+    separator = b"," if fields else b""
+    for key, items in lists.items():
+        yield separator + orjson.dumps(key) + b":["
+        separator = b","
+        for start in range(0, len(items), STREAM_BATCH_ITEMS):
+            batch = b",".join(
+                orjson.dumps(item) for item in items[start : start + STREAM_BATCH_ITEMS]
+            )
+            yield (b"," + batch) if start else batch
+        yield b"]"
+    yield b"}"
+
+
 def create_app() -> Flask:
     mimetypes.add_type("application/javascript", ".mjs")
     static_dir_env = os.environ.get("PDFVIZ_WEB_DIST")
@@ -59,6 +99,11 @@ def create_app() -> Flask:
     else:
         app = Flask(__name__)
     app.config["MAX_CONTENT_LENGTH"] = _max_upload_bytes()
+    # Behind a front-end server, hand PDF bytes back to it instead of Python:
+    # X-Sendfile for Apache/lighttpd, X-Accel-Redirect to an internal nginx
+    # location that aliases the uploads directory.
+    app.config["USE_X_SENDFILE"] = os.environ.get("PDFVIZ_X_SENDFILE") == "1"
+    x_accel_prefix = os.environ.get("PDFVIZ_X_ACCEL_PREFIX", "").rstrip("/")
 
     storage = Storage()
 
@@ -73,7 +118,8 @@ def create_app() -> Flask:
         origin = os.environ.get("PDFVIZ_CORS_ORIGIN", "*")
         response.headers["Access-Control-Allow-Origin"] = origin
         response.headers["Access-Control-Allow-Methods"] = "GET,POST,DELETE,OPTIONS"
-        response.headers["Access-Control-Allow-Headers"] = "Content-Type"
+        response.headers["Access-Control-Allow-Headers"] = "Content-Type,X-Filename,Range"
+        response.headers["Access-Control-Expose-Headers"] = "Accept-Ranges,Content-Range"
         return response
 
     @app.route("/api/health", methods=["GET"])
@@ -82,17 +128,33 @@ def create_app() -> Flask:
 
     @app.route("/api/pdfs", methods=["POST"])
     def upload_pdf():
-        if "file" not in request.files:
-            return {"error": "Missing file"}, 400
-
-        upload = request.files["file"]
-        if not upload or not upload.filename:
-            return {"error": "Missing filename"}, 400
-
         pdf_id = uuid.uuid4().hex
-        filename = secure_filename(upload.filename) or f"{pdf_id}.pdf"
         pdf_path = storage.pdf_path(pdf_id)
-        upload.save(pdf_path)
+
+        if request.mimetype == "application/pdf":
+            # Raw body upload: copy the request stream straight to disk instead
+            # of spooling it through Werkzeug's multipart parser first.
+            raw_name = unquote(request.headers.get("X-Filename", ""))
+            filename = secure_filename(raw_name) or f"{pdf_id}.pdf"
+            try:
+                with pdf_path.open("wb") as fh:
+                    shutil.copyfileobj(request.stream, fh, UPLOAD_CHUNK_BYTES)
+            except Exception:
+                pdf_path.unlink(missing_ok=True)
+                raise
+            if pdf_path.stat().st_size == 0:
+                pdf_path.unlink()
+                return {"error": "Missing file"}, 400
+        else:
+            if "file" not in request.files:
+                return {"error": "Missing file"}, 400
+
+            upload = request.files["file"]
+            if not upload or not upload.filename:
+                return {"error": "Missing filename"}, 400
+
+            filename = secure_filename(upload.filename) or f"{pdf_id}.pdf"
+            upload.save(pdf_path)
 
         try:
             parsed = parse_pdf(str(pdf_path))
@@ -109,11 +171,12 @@ def create_app() -> Flask:
             **info,
         }
 
-        storage.write_json(storage.meta_path(pdf_id), meta)
         storage.write_json(storage.graph_path(pdf_id), parsed["graph"])
         storage.write_json(storage.pages_path(pdf_id), {"pages": parsed["pages"]})
-        storage.write_json(storage.xref_path(pdf_id), parsed["xref"])
         storage.write_json(storage.index_path(pdf_id), {"index": parsed["index"]})
+        storage.write_json(storage.search_path(pdf_id), {"search": parsed["search"]})
+        # meta.json goes last: /status reports "done" once it exists.
+        storage.write_json(storage.meta_path(pdf_id), meta)
 
         return {"id": pdf_id, "meta": meta}, 200
 
@@ -145,38 +208,29 @@ def create_app() -> Flask:
             return {"error": "Not found"}, 404
 
         graph = storage.read_json(graph_path)
-        nodes = graph.get("nodes", [])
-        edges = graph.get("edges", [])
-
-        type_filter = request.args.get("type", "").strip()
-        if type_filter:
-            filtered = []
-            type_filter_lower = type_filter.lower()
-            for node in nodes:
-                node_type = (node.get("type") or "").lower()
-                node_subtype = (node.get("subtype") or "").lower()
-                if node_type == type_filter_lower or node_subtype == type_filter_lower:
-                    filtered.append(node)
-            nodes = filtered
+        type_filter = request.args.get("type", "").strip().lower()
+        nodes, edges = storage.node_selection(pdf_id, type_filter)
 
         total_nodes = len(nodes)
         offset = _int_arg("offset", 0)
         limit = _int_arg("limit", 0)
         if offset or limit:
             nodes = nodes[offset : offset + limit] if limit else nodes[offset:]
+            if len(nodes) < total_nodes:
+                edges = storage.edges_within(pdf_id, {node["id"] for node in nodes})
 
-        allowed = {node["id"] for node in nodes}
-        edges = [edge for edge in edges if edge["from"] in allowed and edge["to"] in allowed]
-
-        response = {
-            "nodes": nodes,
-            "edges": edges,
+        fields = {
             "stats": graph.get("stats", {}),
             "total_nodes": total_nodes,
             "total_edges": len(edges),
             "truncated": len(nodes) < total_nodes,
         }
-        return jsonify(response)
+        if not limit:
+            return Response(
+                _stream_json(fields, {"nodes": nodes, "edges": edges}),
+                mimetype="application/json",
+            )
+        return jsonify({"nodes": nodes, "edges": edges, **fields})
 
     @app.route("/api/pdfs/<pdf_id>/object/<path:obj_id>", methods=["GET"])
     def get_object(pdf_id: str, obj_id: str):
@@ -192,6 +246,30 @@ def create_app() -> Flask:
 
         return jsonify(detail)
 
+    @app.route("/api/pdfs/<pdf_id>/objects", methods=["POST"])
+    def get_objects(pdf_id: str):
+        pdf_path = storage.pdf_path(pdf_id)
+        if not pdf_path.exists():
+            return {"error": "Not found"}, 404
+
+        payload = request.get_json(silent=True)
+        if not isinstance(payload, dict):
+            return {"error": "Expected a JSON object with an ids list"}, 400
+        ids = payload.get("ids")
+        if not isinstance(ids, list) or not all(isinstance(item, str) for item in ids):
+            return {"error": "Expected a list of object ids"}, 400
+        if len(ids) > MAX_BATCH_OBJECTS:
+            return {"error": f"At most {MAX_BATCH_OBJECTS} objects per request"}, 400
+
+        normalized = {obj_id: _normalize_obj_id(obj_id) for obj_id in ids}
+        unique_ids = list(dict.fromkeys(normalized.values()))
+        details, errors = object_details(str(pdf_path), unique_ids)
+        objects = {
+            obj_id: details[norm] for obj_id, norm in normalized.items() if norm in details
+        }
+        failed = {obj_id: errors[norm] for obj_id, norm in normalized.items() if norm in errors}
+        return jsonify({"objects": objects, "errors": failed})
+
     @app.route("/api/pdfs/<pdf_id>/object/<path:obj_id>/stream", methods=["GET"])
     def get_object_stream(pdf_id: str, obj_id: str):
         pdf_path = storage.pdf_path(pdf_id)
@@ -209,31 +287,65 @@ def create_app() -> Flask:
             return {"error": "Object has no stream"}, 404
         return jsonify({"id": detail["id"], **stream})
 
+    @app.route("/api/pdfs/<pdf_id>/content_stream/<path:obj_id>/stats", methods=["GET"])
+    def get_content_stream_stats(pdf_id: str, obj_id: str):
+        pdf_path = storage.pdf_path(pdf_id)
+        if not pdf_path.exists():
+            return {"error": "Not found"}, 404
+
+        normalized = _normalize_obj_id(obj_id)
+        stats_path = storage.stream_stats_path(pdf_id)
+        known = storage.read_json(stats_path) if stats_path.exists() else {}
+        if normalized in known:
+            return known[normalized], 200
+
+        try:
+            stats = content_stream_stats(str(pdf_path), normalized)
+        except Exception as exc:
+            return {"error": "Failed to load stream", "detail": str(exc)}, 400
+
+        storage.merge_json(stats_path, {normalized: stats})
+        return stats, 200
+
     @app.route("/api/pdfs/<pdf_id>/file", methods=["GET"])
     def get_pdf_file(pdf_id: str):
         pdf_path = storage.pdf_path(pdf_id)
         if not pdf_path.exists():
             return {"error": "Not found"}, 404
+        if x_accel_prefix:
+            response = Response(mimetype="application/pdf")
+            response.headers["X-Accel-Redirect"] = f"{x_accel_prefix}/{pdf_path.name}"
+            return response
+        # conditional=True answers Range requests (pdf.js fetches pages in
+        # chunks) and If-None-Match/If-Modified-Since with 206/304.
         return send_file(
             pdf_path,
             mimetype="application/pdf",
             as_attachment=False,
             download_name=pdf_path.name,
+            conditional=True,
         )
 
     @app.route("/api/pdfs/<pdf_id>/xref", methods=["GET"])
     def get_xref(pdf_id: str):
         xref_path = storage.xref_path(pdf_id)
-        if not xref_path.exists():
+        if xref_path.exists():
+            return storage.read_json(xref_path), 200
+
+        pdf_path = storage.pdf_path(pdf_id)
+        if not pdf_path.exists() or not storage.meta_path(pdf_id).exists():
             return {"error": "Not found"}, 404
-        return storage.read_json(xref_path), 200
+        xref = xref_table(str(pdf_path))
+        storage.write_json(xref_path, xref)
+        return xref, 200
 
     @app.route("/api/pdfs/<pdf_id>/pages", methods=["GET"])
     def get_pages(pdf_id: str):
         pages_path = storage.pages_path(pdf_id)
         if not pages_path.exists():
             return {"error": "Not found"}, 404
-        return storage.read_json(pages_path), 200
+        pages = storage.read_json(pages_path).get("pages", [])
+        return Response(_stream_json({}, {"pages": pages}), mimetype="application/json")
 
     @app.route("/api/pdfs/<pdf_id>/search", methods=["GET"])
     def search(pdf_id: str):
@@ -246,36 +358,29 @@ def create_app() -> Flask:
         if not index_path.exists() or not graph_path.exists():
             return {"error": "Not found"}, 404
 
-        index = storage.read_json(index_path).get("index", {})
-        nodes = storage.read_json(graph_path).get("nodes", [])
-        nodes_by_id = {node["id"]: node for node in nodes}
+        search_path = storage.search_path(pdf_id)
+        if search_path.exists():
+            search_index = storage.read_json(search_path).get("search", {})
+        else:
+            # Uploads parsed before search.json existed only have index.json.
+            index = storage.read_json(index_path).get("index", {})
+            search_index = {
+                obj_id: search_text(obj_id, entry) for obj_id, entry in index.items()
+            }
+        nodes_by_id = storage.nodes_by_id(pdf_id)
 
         query_lower = query.lower()
         results: list[dict] = []
-        for obj_id, entry in index.items():
-            if query_lower in obj_id.lower():
+        for obj_id, text in search_index.items():
+            if query_lower in text:
                 results.append(nodes_by_id.get(obj_id, {"id": obj_id}))
-                continue
-
-            fields = [
-                entry.get("type") or "",
-                entry.get("subtype") or "",
-                entry.get("kind") or "",
-                entry.get("label") or "",
-            ]
-            if any(query_lower in field.lower() for field in fields):
-                results.append(nodes_by_id.get(obj_id, {"id": obj_id}))
-                continue
-
-            keys = entry.get("keys") or []
-            if any(query_lower in key.lower() for key in keys):
-                results.append(nodes_by_id.get(obj_id, {"id": obj_id}))
-
-        results = results[:200]
+                if len(results) == SEARCH_RESULT_LIMIT:
+                    break
         return {"results": results, "count": len(results)}, 200
 
     @app.route("/api/pdfs/<pdf_id>", methods=["DELETE"])
     def delete_pdf(pdf_id: str):
+        close_cached_pdf(str(storage.pdf_path(pdf_id)))
         storage.remove_pdf(pdf_id)
         return {"status": "deleted"}, 200
 
@@ -1,11 +1,18 @@
 from __future__ import annotations
 
 import io
+import multiprocessing
+import os
 import re
 import string
-from collections import Counter
-from dataclasses import dataclass
-from typing import Any
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import repeat
+from typing import Any, Iterator
 
 try:
     import pikepdf
@@ -17,6 +24,128 @@ MAX_REFERENCE_DEPTH = 6
 MAX_DICT_ITEMS = 50
 MAX_LIST_ITEMS = 50
 MAX_PREVIEW_BYTES = 8192
+MAX_OPEN_PDFS = 8
+PARALLEL_MIN_OBJECTS = 5000
+PARALLEL_CHUNK_OBJECTS = 2048
+
+OBJ_ID_SPLIT_RE = re.compile(r"[\s:_-]+")
+PRINTABLE_BYTES = string.printable.encode("ascii")
+
+NAME_ANNOTS = pikepdf.Name.Annots
+NAME_CONTENTS = pikepdf.Name.Contents
+NAME_FILTER = pikepdf.Name.Filter
+NAME_LENGTH = pikepdf.Name.Length
+NAME_RESOURCES = pikepdf.Name.Resources
+NAME_SUBTYPE = pikepdf.Name.Subtype
+NAME_TYPE = pikepdf.Name.Type
+NAME_XOBJECT = pikepdf.Name.XObject
+
+
+@dataclass(eq=False)
+class _OpenPdf:
+    mtime_ns: int
+    pdf: Any
+    # Serializes use of the Pdf; QPDF objects are not thread-safe.
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    # Callers currently holding or waiting for the handle. An evicted entry
+    # is closed by whoever drops this to zero, never under a waiting caller.
+    users: int = 0
+    evicted: bool = False
+
+
+# path -> _OpenPdf, oldest first. Guarded by _open_pdfs_lock, which also
+# guards every entry's users/evicted fields.
+_open_pdfs: OrderedDict[str, _OpenPdf] = OrderedDict()
+_open_pdfs_lock = threading.Lock()
+
+
+def _evict(entry: _OpenPdf, closable: list[_OpenPdf]) -> None:
+    """Mark entry evicted; queue it for closing if nobody is using it."""
+    entry.evicted = True
+    if entry.users == 0:
+        closable.append(entry)
+
+
+def _close_entries(entries: list[_OpenPdf]) -> None:
+    for entry in entries:
+        entry.pdf.close()
+
+
+def _acquire_cached_pdf(path: str) -> _OpenPdf:
+    mtime_ns = os.stat(path).st_mtime_ns
+    with _open_pdfs_lock:
+        entry = _open_pdfs.get(path)
+        if entry is not None and entry.mtime_ns == mtime_ns:
+            entry.users += 1
+            _open_pdfs.move_to_end(path)
+            return entry
+
+    # Open outside the global lock so a slow cold open does not stall
+    # lookups of other files; a concurrent opener may win the install.
+    opened = _OpenPdf(mtime_ns, pikepdf.open(path))
+    closable: list[_OpenPdf] = []
+    with _open_pdfs_lock:
+        entry = _open_pdfs.get(path)
+        if entry is not None and entry.mtime_ns == mtime_ns:
+            closable.append(opened)
+        else:
+            if entry is not None:
+                _evict(_open_pdfs.pop(path), closable)
+            entry = opened
+            _open_pdfs[path] = entry
+        entry.users += 1
+        _open_pdfs.move_to_end(path)
+        while len(_open_pdfs) > MAX_OPEN_PDFS:
+            _evict(_open_pdfs.popitem(last=False)[1], closable)
+    _close_entries(closable)
+    return entry
+
+
+def _release_cached_pdf(entry: _OpenPdf) -> None:
+    with _open_pdfs_lock:
+        entry.users -= 1
+        closable = [entry] if entry.evicted and entry.users == 0 else []
+    _close_entries(closable)
+
+
+@contextmanager
+def open_cached_pdf(path: str) -> Iterator[Any]:
+    """Yield an open Pdf for path, reusing handles across requests.
+
+    Handles are keyed by path and reopened when the file's mtime changes. The
+    least recently used handle is evicted once more than MAX_OPEN_PDFS are
+    cached, and closed when its last user releases it. QPDF objects are not
+    thread-safe, so each handle is used by one caller at a time.
+    """
+    entry = _acquire_cached_pdf(path)
+    try:
+        with entry.lock:
+            yield entry.pdf
+    finally:
+        _release_cached_pdf(entry)
+
+
+def close_cached_pdf(path: str) -> None:
+    closable: list[_OpenPdf] = []
+    with _open_pdfs_lock:
+        entry = _open_pdfs.pop(path, None)
+        if entry is not None:
+            _evict(entry, closable)
+    _close_entries(closable)
+
+
+# Content-stream tokenizer: string literals, hex strings and comments are
+# consumed whole so operators inside them are ignored; only the
+# text-showing operators (Tj, TJ, ', ") populate the capture group.
+_TOKEN_CHAR = rb"[^(<>%\[\]{}'\"\n\r\t\f ]"
+TEXT_OP_RE = re.compile(
+    rb"\((?:[^\\)]|\\[\s\S]?)*\)?"
+    rb"|<<|<[^>]*>?"
+    rb"|%[^\r\n]*"
+    rb"|(T[jJ](?!" + _TOKEN_CHAR + rb")|['\"])"
+    rb"|" + _TOKEN_CHAR + rb"+"
+    rb"|[\s\S]"
+)
 
 
 @dataclass(frozen=True)
@@ -29,9 +158,10 @@ def format_objgen(objgen: tuple[int, int]) -> str:
     return f"{objgen[0]} {objgen[1]} R"
 
 
+@lru_cache(maxsize=4096)
 def parse_obj_id(value: str) -> tuple[int, int]:
     cleaned = value.strip().replace("R", "").replace("r", "")
-    parts = re.split(r"[\s:_-]+", cleaned)
+    parts = OBJ_ID_SPLIT_RE.split(cleaned)
     if len(parts) < 2:
         raise ValueError("Object id must include object and generation numbers")
     return int(parts[0]), int(parts[1])
@@ -48,14 +178,11 @@ def _key_name(value: Any) -> str:
     return str(value)
 
 
-def _dict_get(obj: Any, key: str) -> Any | None:
+def _dict_get(obj: Any, key: pikepdf.Name) -> Any | None:
     try:
         return obj.get(key)
     except Exception:
-        try:
-            return obj.get(pikepdf.Name(key))
-        except Exception:
-            return None
+        return None
 
 
 def _is_dictionary(value: Any) -> bool:
@@ -79,7 +206,7 @@ def _extract_filters(stream_dict: Any) -> list[str]:
     if stream_dict is None:
         return filters
 
-    filter_value = _dict_get(stream_dict, "/Filter")
+    filter_value = _dict_get(stream_dict, NAME_FILTER)
     if filter_value is None:
         return filters
 
@@ -146,6 +273,21 @@ def _simplify(value: Any, depth: int) -> Any:
     return str(value)
 
 
+def _join_path(node: tuple | None) -> str:
+    segments: list[str] = []
+    while node is not None:
+        node, segment = node
+        segments.append(segment)
+    return "".join(reversed(segments))
+
+
+def _path_node(parent: tuple | None, key: Any) -> tuple:
+    if isinstance(key, int):
+        return parent, f"[{key}]"
+    name = _key_name(key)
+    return parent, f"/{name}" if parent else name
+
+
 def _collect_references(
     value: Any,
     source_id: str,
@@ -157,49 +299,66 @@ def _collect_references(
     if depth < 0 or value is None:
         return
 
+    node = (None, path) if path else None
     if _is_indirect(value) and not root:
         target_id = format_objgen(value.objgen)
         if target_id != source_id:
             edges.add((source_id, target_id, path or "ref"))
         return
 
-    if _is_stream(value):
-        _collect_references(value.stream_dict, source_id, path, edges, depth - 1)
-        return
-
-    if _is_dictionary(value):
-        for key, item in value.items():
-            next_path = f"{path}/{_key_name(key)}" if path else _key_name(key)
-            _collect_references(item, source_id, next_path, edges, depth - 1)
-        return
+    # Explicit stack of (container, path node, depth). A path node is a
+    # (parent node, segment) pair that is only created for references and
+    # containers, and only joined into a string when an edge is emitted.
+    # pikepdf hands back ints, bools and reals as plain Python values, so the
+    # pikepdf.Object check drops most scalars before the costlier type tests.
+    pdf_object, dictionary, array, stream = (
+        pikepdf.Object,
+        pikepdf.Dictionary,
+        pikepdf.Array,
+        pikepdf.Stream,
+    )
+    stack: list[tuple[Any, tuple | None, int]] = [(value, node, depth)]
+    while stack:
+        item, node, level = stack.pop()
+        if isinstance(item, stream):
+            item = item.stream_dict
+            level -= 1
+        if isinstance(item, dictionary):
+            children = item.items()
+        elif isinstance(item, array):
+            children = enumerate(item)
+        else:
+            continue
+        if level < 1:
+            continue
 
-    if _is_array(value):
-        for idx, item in enumerate(value):
-            next_path = f"{path}[{idx}]" if path else f"[{idx}]"
-            _collect_references(item, source_id, next_path, edges, depth - 1)
+        for key, child in children:
+            if not isinstance(child, pdf_object):
+                continue
+            if child.is_indirect:
+                target_id = format_objgen(child.objgen)
+                if target_id != source_id:
+                    child_path = _join_path(_path_node(node, key))
+                    edges.add((source_id, target_id, child_path))
+            elif isinstance(child, (dictionary, array, stream)):
+                stack.append((child, _path_node(node, key), level - 1))
 
 
 def _list_references(value: Any, depth: int = 3) -> list[str]:
     refs: set[str] = set()
-
-    def walk(item: Any, level: int) -> None:
+    stack: list[tuple[Any, int]] = [(value, depth)]
+    while stack:
+        item, level = stack.pop()
         if level < 0 or item is None:
-            return
+            continue
         if _is_indirect(item):
             refs.add(format_objgen(item.objgen))
-            return
-        if _is_stream(item):
-            walk(item.stream_dict, level - 1)
-            return
-        if _is_dictionary(item):
-            for _, value in item.items():
-                walk(value, level - 1)
-            return
-        if _is_array(item):
-            for value in item:
-                walk(value, level - 1)
-
-    walk(value, depth)
+        elif _is_stream(item):
+            stack.append((item.stream_dict, level - 1))
+        elif _is_dictionary(item):
+            stack.extend((child, level - 1) for child in item.values())
+        elif _is_array(item):
+            stack.extend((child, level - 1) for child in item)
     return sorted(refs)
 
 
@@ -216,8 +375,8 @@ def _object_type_info(value: Any) -> tuple[str, str | None, str, bool]:
     type_name = None
     subtype = None
     if dict_obj is not None:
-        type_name = _strip_name(_dict_get(dict_obj, "/Type"))
-        subtype = _strip_name(_dict_get(dict_obj, "/Subtype"))
+        type_name = _strip_name(_dict_get(dict_obj, NAME_TYPE))
+        subtype = _strip_name(_dict_get(dict_obj, NAME_SUBTYPE))
 
     resolved_type = type_name or kind
     return resolved_type, subtype, kind, has_stream
@@ -231,7 +390,7 @@ def _node_label(type_name: str, subtype: str | None) -> str:
 
 def _node_size(value: Any) -> int | None:
     if _is_stream(value):
-        length_value = _dict_get(value.stream_dict, "/Length")
+        length_value = _dict_get(value.stream_dict, NAME_LENGTH)
         return _safe_int(length_value)
     if _is_dictionary(value):
         return len(list(value.keys()))
@@ -245,106 +404,21 @@ def _detect_binary(data: bytes) -> bool:
         return False
     if b"\x00" in data:
         return True
-    printable = set(bytes(string.printable, "ascii"))
     sample = data[:2048]
-    non_printable = sum(1 for b in sample if b not in printable)
+    # translate() drops the printable bytes in C; what is left is non-printable.
+    non_printable = len(sample.translate(None, PRINTABLE_BYTES))
     return non_printable / max(len(sample), 1) > 0.3
 
 
 def _count_text_ops(data: bytes) -> int:
     if not data:
         return 0
-
-    count = 0
-    token = bytearray()
-    in_string = False
-    in_hex = False
-    escape = False
-    idx = 0
-
-    def flush_token() -> None:
-        nonlocal count
-        if not token:
-            return
-        value = bytes(token)
-        if value in (b"Tj", b"TJ", b"'", b'"'):
-            count += 1
-        token.clear()
-
-    while idx < len(data):
-        char = data[idx]
-
-        if in_string:
-            if escape:
-                escape = False
-            elif char == ord("\\"):
-                escape = True
-            elif char == ord(")"):
-                in_string = False
-            idx += 1
-            continue
-
-        if in_hex:
-            if char == ord(">"):
-                in_hex = False
-            idx += 1
-            continue
-
-        if char == ord("("):
-            flush_token()
-            in_string = True
-            idx += 1
-            continue
-
-        if char == ord("<"):
-            flush_token()
-            if idx + 1 < len(data) and data[idx + 1] == ord("<"):
-                idx += 2
-            else:
-                in_hex = True
-                idx += 1
-            continue
-
-        if char == ord(">"):
-            flush_token()
-            if idx + 1 < len(data) and data[idx + 1] == ord(">"):
-                idx += 2
-            else:
-                idx += 1
-            continue
-
-        if char == ord("%"):
-            flush_token()
-            while idx < len(data) and data[idx] not in (ord("\n"), ord("\r")):
-                idx += 1
-            continue
-
-        if char in (ord("\n"), ord("\r"), ord("\t"), ord("\f"), ord(" ")):
-            flush_token()
-            idx += 1
-            continue
-
-        if char in (ord("["), ord("]"), ord("{"), ord("}")):
-            flush_token()
-            idx += 1
-            continue
-
-        if char in (ord("'"), ord('"')):
-            flush_token()
-            token.append(char)
-            flush_token()
-            idx += 1
-            continue
-
-        token.append(char)
-        idx += 1
-
-    flush_token()
-    return count
+    ops = TEXT_OP_RE.findall(data)
+    return len(ops) - ops.count(b"")
 
 
 def _content_stream_entries(page_obj: Any) -> list[dict[str, Any]]:
-    contents = _dict_get(page_obj, "/Contents")
+    contents = _dict_get(page_obj, NAME_CONTENTS)
     if contents is None:
         return []
 
@@ -356,38 +430,51 @@ def _content_stream_entries(page_obj: Any) -> list[dict[str, Any]]:
             continue
 
         obj_id = format_objgen(stream.objgen) if stream.is_indirect else None
-        length = _safe_int(_dict_get(stream.stream_dict, "/Length"))
-        decoded = True
-
-        try:
-            data = stream.read_bytes()
-        except Exception:
-            decoded = False
-            try:
-                data = stream.read_raw_bytes()
-            except Exception:
-                data = b""
-
-        text_ops = _count_text_ops(data)
+        length = _safe_int(_dict_get(stream.stream_dict, NAME_LENGTH))
 
+        # decoded/text_ops need the stream decompressed; they are filled in on
+        # demand by content_stream_stats instead of at upload time.
         entries.append(
             {
                 "id": obj_id,
                 "length": length,
-                "decoded": decoded,
-                "text_ops": text_ops,
+                "decoded": None,
+                "text_ops": None,
             }
         )
 
     return entries
 
 
+def _content_stream_stats(stream: Any) -> dict[str, Any]:
+    decoded = True
+    try:
+        data = stream.read_bytes()
+    except Exception:
+        decoded = False
+        try:
+            data = stream.read_raw_bytes()
+        except Exception:
+            data = b""
+
+    return {"decoded": decoded, "text_ops": _count_text_ops(data)}
+
+
+def content_stream_stats(path: str, obj_id: str) -> dict[str, Any]:
+    objgen = parse_obj_id(obj_id)
+    with open_cached_pdf(path) as pdf:
+        stream = pdf.get_object(objgen)
+        if not _is_stream(stream):
+            raise ValueError(f"{format_objgen(objgen)} is not a stream")
+        return {"id": format_objgen(objgen), **_content_stream_stats(stream)}
+
+
 def _page_xobjects(page_obj: Any) -> list[dict[str, Any]]:
-    resources = _dict_get(page_obj, "/Resources")
+    resources = _dict_get(page_obj, NAME_RESOURCES)
     if resources is None or not _is_dictionary(resources):
         return []
 
-    xobjects_dict = _dict_get(resources, "/XObject")
+    xobjects_dict = _dict_get(resources, NAME_XOBJECT)
     if xobjects_dict is None or not _is_dictionary(xobjects_dict):
         return []
 
@@ -411,70 +498,137 @@ def _page_xobjects(page_obj: Any) -> list[dict[str, Any]]:
     return xobjects
 
 
-def parse_pdf(path: str) -> dict[str, Any]:
-    with pikepdf.open(path) as pdf:
-        nodes: list[dict[str, Any]] = []
-        edges: set[tuple[str, str, str]] = set()
-        type_counts: Counter[str] = Counter()
-        index: dict[str, dict[str, Any]] = {}
-
-        for obj in pdf.objects:
-            if obj is None:
-                continue
-            if not hasattr(obj, "objgen"):
-                continue
-
-            obj_id = format_objgen(obj.objgen)
-            obj_type, subtype, kind, has_stream = _object_type_info(obj)
-            label = _node_label(obj_type, subtype)
-            size = _node_size(obj)
-
-            nodes.append(
-                {
-                    "id": obj_id,
-                    "type": obj_type,
-                    "subtype": subtype,
-                    "kind": kind,
-                    "label": label,
-                    "size": size,
-                    "has_stream": has_stream,
-                }
-            )
-
-            type_counts[obj_type] += 1
+def _scan_objects(
+    objects: Any,
+) -> tuple[
+    list[dict[str, Any]],
+    dict[str, dict[str, Any]],
+    set[tuple[str, str, str]],
+    Counter[str],
+]:
+    nodes: list[dict[str, Any]] = []
+    edges: set[tuple[str, str, str]] = set()
+    type_counts: Counter[str] = Counter()
+    index: dict[str, dict[str, Any]] = {}
+
+    for obj in objects:
+        if obj is None:
+            continue
+        if not hasattr(obj, "objgen"):
+            continue
 
-            keys: list[str] = []
-            if _is_dictionary(obj):
-                keys = [_key_name(key) for key in obj.keys()]
-            elif _is_stream(obj):
-                keys = [_key_name(key) for key in obj.stream_dict.keys()]
+        obj_id = format_objgen(obj.objgen)
+        obj_type, subtype, kind, has_stream = _object_type_info(obj)
+        label = _node_label(obj_type, subtype)
+        size = _node_size(obj)
 
-            index[obj_id] = {
+        nodes.append(
+            {
+                "id": obj_id,
                 "type": obj_type,
                 "subtype": subtype,
                 "kind": kind,
-                "keys": keys,
-                "has_stream": has_stream,
                 "label": label,
+                "size": size,
+                "has_stream": has_stream,
             }
+        )
 
-            _collect_references(
-                obj, obj_id, "", edges, depth=MAX_REFERENCE_DEPTH, root=True
-            )
+        type_counts[obj_type] += 1
+
+        keys: list[str] = []
+        if _is_dictionary(obj):
+            keys = [_key_name(key) for key in obj.keys()]
+        elif _is_stream(obj):
+            keys = [_key_name(key) for key in obj.stream_dict.keys()]
+
+        index[obj_id] = {
+            "type": obj_type,
+            "subtype": subtype,
+            "kind": kind,
+            "keys": keys,
+            "has_stream": has_stream,
+            "label": label,
+        }
+
+        _collect_references(
+            obj, obj_id, "", edges, depth=MAX_REFERENCE_DEPTH, root=True
+        )
+
+    return nodes, index, edges, type_counts
+
+
+def search_text(obj_id: str, entry: dict[str, Any]) -> str:
+    """Lowercased blob of every field /search matches against.
+
+    Fields are newline-separated so a query cannot match across two of them.
+    """
+    fields = [
+        obj_id,
+        entry.get("type") or "",
+        entry.get("subtype") or "",
+        entry.get("kind") or "",
+        entry.get("label") or "",
+        *(entry.get("keys") or []),
+    ]
+    return "\n".join(fields).lower()
+
+
+def _scan_object_range(path: str, start: int, stop: int):
+    """Worker entry point: scan pdf.objects[start:stop] from a private handle."""
+    with pikepdf.open(path) as pdf:
+        objects = pdf.objects
+        return _scan_objects(objects[idx] for idx in range(start, stop))
+
+
+def _scan_all_objects(path: str, pdf: Any):
+    object_count = len(pdf.objects)
+    workers = min(os.cpu_count() or 1, -(-object_count // PARALLEL_CHUNK_OBJECTS))
+    if object_count < PARALLEL_MIN_OBJECTS or workers < 2:
+        return [_scan_objects(pdf.objects)]
 
-        edges_list = [
-            {"from": source, "to": target, "via_key": via}
-            for source, target, via in sorted(edges)
-        ]
+    # QPDF handles are not thread-safe, so each worker process opens its own
+    # and scans a contiguous slice; results are merged in object order.
+    starts = list(range(0, object_count, PARALLEL_CHUNK_OBJECTS))
+    stops = [min(start + PARALLEL_CHUNK_OBJECTS, object_count) for start in starts]
+    # forkserver rather than fork: this runs inside a threaded server, and
+    # forking a process with other threads alive can deadlock the child.
+    context = multiprocessing.get_context("forkserver")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        return list(executor.map(_scan_object_range, repeat(path), starts, stops))
 
+
+def parse_pdf(path: str) -> dict[str, Any]:
+    with pikepdf.open(path) as pdf:
+        nodes: list[dict[str, Any]] = []
+        edges_list: list[tuple[str, str, str]] = []
         degree: Counter[str] = Counter()
-        for edge in edges_list:
-            degree[edge["from"]] += 1
-            degree[edge["to"]] += 1
+        type_counts: Counter[str] = Counter()
+        index: dict[str, dict[str, Any]] = {}
+
+        for chunk_nodes, chunk_index, chunk_edges, chunk_counts in _scan_all_objects(
+            path, pdf
+        ):
+            nodes.extend(chunk_nodes)
+            index.update(chunk_index)
+            type_counts.update(chunk_counts)
+            # Each chunk's edge set is already unique, and chunks never share a
+            # source object, so edges can be collected and counted as they arrive.
+            edges_list.extend(chunk_edges)
+            for source, target, _ in chunk_edges:
+                degree[source] += 1
+                degree[target] += 1
+        edges_list.sort()
+        from_ids = [edge[0] for edge in edges_list]
+        to_ids = [edge[1] for edge in edges_list]
+        via_keys = [edge[2] for edge in edges_list]
+
+        search = {obj_id: search_text(obj_id, entry) for obj_id, entry in index.items()}
 
         graph = {
             "nodes": nodes,
-            "edges": edges_list,
+            # Parallel columns rather than one dict per edge; see Storage.edges_by_from.
+            "edges": {"from": from_ids, "to": to_ids, "via_key": via_keys},
             "stats": {
                 "type_counts": dict(type_counts),
                 "stream_count": sum(1 for node in nodes if node["has_stream"]),
@@ -486,9 +640,9 @@ def parse_pdf(path: str) -> dict[str, Any]:
         for idx, page in enumerate(pdf.pages):
             page_obj = page.obj
             page_id = format_objgen(page_obj.objgen) if page_obj.is_indirect else None
-            resources = _list_references(_dict_get(page_obj, "/Resources"))
-            contents = _list_references(_dict_get(page_obj, "/Contents"))
-            annots = _list_references(_dict_get(page_obj, "/Annots"))
+            resources = _list_references(_dict_get(page_obj, NAME_RESOURCES))
+            contents = _list_references(_dict_get(page_obj, NAME_CONTENTS))
+            annots = _list_references(_dict_get(page_obj, NAME_ANNOTS))
             content_streams = _content_stream_entries(page_obj)
             xobjects = _page_xobjects(page_obj)
             pages.append(
@@ -504,13 +658,6 @@ def parse_pdf(path: str) -> dict[str, Any]:
                 }
             )
 
-        xref_buffer = io.StringIO()
-        try:
-            pdf.show_xref_table(xref_buffer)
-            xref_text = xref_buffer.getvalue().splitlines()
-        except Exception:
-            xref_text = []
-
         info = {
             "page_count": len(pdf.pages),
             "object_count": len(nodes),
@@ -522,46 +669,78 @@ def parse_pdf(path: str) -> dict[str, Any]:
         return {
             "graph": graph,
             "pages": pages,
-            "xref": {"lines": xref_text},
             "index": index,
+            "search": search,
             "info": info,
         }
 
 
+def xref_table(path: str) -> dict[str, Any]:
+    """Render the cross-reference table; only built when /xref is requested."""
+    with open_cached_pdf(path) as pdf:
+        xref_buffer = io.StringIO()
+        try:
+            pdf.show_xref_table(xref_buffer)
+            xref_text = xref_buffer.getvalue().splitlines()
+        except Exception:
+            xref_text = []
+    return {"lines": xref_text}
+
+
 def object_detail(path: str, obj_id: str) -> dict[str, Any]:
     objgen = parse_obj_id(obj_id)
-    with pikepdf.open(path) as pdf:
-        obj = pdf.get_object(objgen)
+    with open_cached_pdf(path) as pdf:
+        return _object_detail(pdf, objgen)
 
-        obj_type, subtype, kind, has_stream = _object_type_info(obj)
-        label = _node_label(obj_type, subtype)
-        size = _node_size(obj)
 
-        refs: list[ObjRef] = []
-        edges: set[tuple[str, str, str]] = set()
-        _collect_references(obj, format_objgen(objgen), "", edges, depth=MAX_REFERENCE_DEPTH, root=True)
-        for source, target, via in sorted(edges):
-            if source == format_objgen(objgen):
-                refs.append(ObjRef(obj_id=target, path=via))
+def object_details(path: str, obj_ids: list[str]) -> tuple[dict[str, Any], dict[str, str]]:
+    """Load several objects under one hold of the cached Pdf.
 
-        detail: dict[str, Any] = {
-            "id": format_objgen(objgen),
-            "type": obj_type,
-            "subtype": subtype,
-            "kind": kind,
-            "label": label,
-            "size": size,
-            "has_stream": has_stream,
-            "dict": _simplify(obj.stream_dict if _is_stream(obj) else obj, 4)
-            if (_is_dictionary(obj) or _is_stream(obj))
-            else None,
-            "refs": [ref.__dict__ for ref in refs],
-        }
+    Returns (details, errors), both keyed by the requested id.
+    """
+    details: dict[str, Any] = {}
+    errors: dict[str, str] = {}
+    with open_cached_pdf(path) as pdf:
+        for obj_id in obj_ids:
+            try:
+                details[obj_id] = _object_detail(pdf, parse_obj_id(obj_id))
+            except Exception as exc:
+                errors[obj_id] = str(exc)
+    return details, errors
+
+
+def _object_detail(pdf: Any, objgen: tuple[int, int]) -> dict[str, Any]:
+    obj = pdf.get_object(objgen)
+
+    obj_type, subtype, kind, has_stream = _object_type_info(obj)
+    label = _node_label(obj_type, subtype)
+    size = _node_size(obj)
+
+    refs: list[ObjRef] = []
+    edges: set[tuple[str, str, str]] = set()
+    _collect_references(obj, format_objgen(objgen), "", edges, depth=MAX_REFERENCE_DEPTH, root=True)
+    for source, target, via in sorted(edges):
+        if source == format_objgen(objgen):
+            refs.append(ObjRef(obj_id=target, path=via))
+
+    detail: dict[str, Any] = {
+        "id": format_objgen(objgen),
+        "type": obj_type,
+        "subtype": subtype,
+        "kind": kind,
+        "label": label,
+        "size": size,
+        "has_stream": has_stream,
+        "dict": _simplify(obj.stream_dict if _is_stream(obj) else obj, 4)
+        if (_is_dictionary(obj) or _is_stream(obj))
+        else None,
+        "refs": [ref.__dict__ for ref in refs],
+    }
 
-        if _is_stream(obj):
-            detail["stream"] = stream_preview(obj)
+    if _is_stream(obj):
+        detail["stream"] = stream_preview(obj)
 
-        return detail
+    return detail
 
 
 def stream_preview(obj: Any) -> dict[str, Any]:
@@ -591,7 +770,7 @@ def stream_preview(obj: Any) -> dict[str, Any]:
         encoding = "utf-8"
 
     stream_dict = obj.stream_dict
-    stream_length = _safe_int(_dict_get(stream_dict, "/Length"))
+    stream_length = _safe_int(_dict_get(stream_dict, NAME_LENGTH))
     filters = _extract_filters(stream_dict)
 
     return {
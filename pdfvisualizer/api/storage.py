@@ -1,8 +1,13 @@
-import json
 import os
 import tempfile
+import threading
+from collections import OrderedDict
 from pathlib import Path
 
+import orjson
+
+JSON_CACHE_SIZE = 16
+
 
 class Storage:
     def __init__(self, base_dir: str | None = None) -> None:
@@ -16,6 +21,13 @@ class Storage:
         self.parsed_dir = self.base_dir / "parsed"
         self._ensure_dirs()
 
+        # path -> [mtime_ns, parsed data, derived views], most recent last.
+        # Cached dicts are shared between requests and must not be mutated.
+        self._json_cache: OrderedDict[str, list] = OrderedDict()
+        self._json_cache_lock = threading.Lock()
+        # path -> lock serializing read-merge-write updates of that file.
+        self._merge_locks: dict[str, threading.Lock] = {}
+
     def _ensure_dirs(self) -> None:
         self.uploads_dir.mkdir(parents=True, exist_ok=True)
         self.parsed_dir.mkdir(parents=True, exist_ok=True)
@@ -41,15 +53,150 @@ class Storage:
     def index_path(self, pdf_id: str) -> Path:
         return self.parsed_path(pdf_id) / "index.json"
 
+    def search_path(self, pdf_id: str) -> Path:
+        return self.parsed_path(pdf_id) / "search.json"
+
+    def stream_stats_path(self, pdf_id: str) -> Path:
+        return self.parsed_path(pdf_id) / "stream_stats.json"
+
     def error_path(self, pdf_id: str) -> Path:
         return self.parsed_path(pdf_id) / "error.json"
 
     def write_json(self, path: Path, data: dict) -> None:
         path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(json.dumps(data, indent=2, sort_keys=True), encoding="utf-8")
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+        # Write beside the target and rename over it so readers never see a
+        # partially written file; the name is unique per writer thread.
+        tmp_path = path.with_name(
+            f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        try:
+            with tmp_path.open("wb") as fh:
+                fh.write(payload)
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        self._forget(path)
+
+    def merge_json(self, path: Path, updates: dict) -> None:
+        """Add updates to the JSON object at path (created if missing).
+
+        Updates to one file are serialized so concurrent callers cannot drop
+        each other's keys.
+        """
+        with self._json_cache_lock:
+            lock = self._merge_locks.setdefault(str(path), threading.Lock())
+        with lock:
+            current = self.read_json(path) if path.exists() else {}
+            self.write_json(path, {**current, **updates})
 
     def read_json(self, path: Path) -> dict:
-        return json.loads(path.read_text(encoding="utf-8"))
+        return self._cached_entry(path)[1]
+
+    def nodes_by_id(self, pdf_id: str) -> dict[str, dict]:
+        return self._graph_view(
+            pdf_id,
+            "nodes_by_id",
+            lambda graph: {node["id"]: node for node in graph.get("nodes", [])},
+        )
+
+    def edges_by_from(self, pdf_id: str) -> dict[str, list[dict]]:
+        """Outgoing edges per source id, keyed in graph.json edge order.
+
+        graph.json stores edges as parallel from/to/via_key columns (older
+        uploads have a list of dicts); either way each edge is handed out as a
+        {"from", "to", "via_key"} dict built once per cached graph.
+        """
+
+        def build(graph: dict) -> dict[str, list[dict]]:
+            edges = graph.get("edges", [])
+            if not isinstance(edges, list):
+                edges = [
+                    {"from": source, "to": target, "via_key": via}
+                    for source, target, via in zip(
+                        edges["from"], edges["to"], edges["via_key"]
+                    )
+                ]
+            adjacency: dict[str, list[dict]] = {}
+            for edge in edges:
+                adjacency.setdefault(edge["from"], []).append(edge)
+            return adjacency
+
+        return self._graph_view(pdf_id, "edges_by_from", build)
+
+    def node_selection(self, pdf_id: str, type_filter: str) -> tuple[list[dict], list[dict]]:
+        """Nodes whose lowercased type or subtype equals type_filter ("" for
+        all nodes) and the edges between them.
+
+        Non-empty selections are cached with the graph, so repeat /graph
+        requests skip the node filter, the id set and the edge walk.
+        """
+        selections = self._graph_view(pdf_id, "selections", lambda graph: {})
+        selection = selections.get(type_filter)
+        if selection is not None:
+            return selection
+
+        nodes = self.read_json(self.graph_path(pdf_id)).get("nodes", [])
+        if type_filter:
+            nodes = [
+                node
+                for node in nodes
+                if (node.get("type") or "").lower() == type_filter
+                or (node.get("subtype") or "").lower() == type_filter
+            ]
+        node_ids = frozenset(node["id"] for node in nodes)
+        selection = (nodes, self.edges_within(pdf_id, node_ids))
+        if nodes:
+            selections[type_filter] = selection
+        return selection
+
+    def edges_within(self, pdf_id: str, node_ids: frozenset[str] | set[str]) -> list[dict]:
+        """Edges with both ends in node_ids, in graph.json order."""
+        # Edges are stored sorted by source id, so walking sources in sorted
+        # order keeps graph.json order without scanning every edge; small
+        # selections only touch their own adjacency lists.
+        edges_by_from = self.edges_by_from(pdf_id)
+        if len(node_ids) < len(edges_by_from):
+            sources = sorted(node_ids)
+        else:
+            sources = [source for source in edges_by_from if source in node_ids]
+        return [
+            edge
+            for source in sources
+            for edge in edges_by_from.get(source, ())
+            if edge["to"] in node_ids
+        ]
+
+    def _graph_view(self, pdf_id: str, name: str, build):
+        entry = self._cached_entry(self.graph_path(pdf_id))
+        views = entry[2]
+        view = views.get(name)
+        if view is None:
+            view = build(entry[1])
+            views[name] = view
+        return view
+
+    def _cached_entry(self, path: Path) -> list:
+        key = str(path)
+        mtime_ns = path.stat().st_mtime_ns
+        with self._json_cache_lock:
+            entry = self._json_cache.get(key)
+            if entry is not None and entry[0] == mtime_ns:
+                self._json_cache.move_to_end(key)
+                return entry
+
+        entry = [mtime_ns, orjson.loads(path.read_bytes()), {}]
+        with self._json_cache_lock:
+            self._json_cache[key] = entry
+            self._json_cache.move_to_end(key)
+            while len(self._json_cache) > JSON_CACHE_SIZE:
+                self._json_cache.popitem(last=False)
+        return entry
+
+    def _forget(self, path: Path) -> None:
+        with self._json_cache_lock:
+            self._json_cache.pop(str(path), None)
 
     def remove_pdf(self, pdf_id: str) -> None:
         pdf_path = self.pdf_path(pdf_id)
@@ -59,5 +206,8 @@ class Storage:
         parsed_dir = self.parsed_path(pdf_id)
         if parsed_dir.exists():
             for item in parsed_dir.glob("*"):
+                self._forget(item)
+                with self._json_cache_lock:
+                    self._merge_locks.pop(str(item), None)
                 item.unlink()
             parsed_dir.rmdir()
@@ -15,6 +15,7 @@
             flask
             ipython
             numpy
+            orjson
             pikepdf
             torch
           ];
@@ -11,9 +11,14 @@ async function request(path, options = {}) {
 }
 
 export async function uploadPdf(file) {
-  const form = new FormData();
-  form.append("file", file);
-  return request("/api/pdfs", { method: "POST", body: form });
+  return request("/api/pdfs", {
+    method: "POST",
+    headers: {
+      "Content-Type": "application/pdf",
+      "X-Filename": encodeURIComponent(file.name),
+    },
+    body: file,
+  });
 }
 
 export async function getPdfMeta(pdfId) {
@@ -28,6 +33,10 @@ export async function getObjectDetail(pdfId, objId) {
   return request(`/api/pdfs/${pdfId}/object/${encodeURIComponent(objId)}`);
 }
 
+export async function getContentStreamStats(pdfId, objId) {
+  return request(`/api/pdfs/${pdfId}/content_stream/${encodeURIComponent(objId)}/stats`);
+}
+
 export async function searchObjects(pdfId, query) {
   return request(`/api/pdfs/${pdfId}/search?q=${encodeURIComponent(query)}`);
 }
@@ -1,6 +1,7 @@
 import { useEffect, useMemo, useRef, useState } from "react";
 import { GlobalWorkerOptions, Util, getDocument } from "pdfjs-dist";
 import workerSrc from "pdfjs-dist/build/pdf.worker.min.mjs?url";
+import { getContentStreamStats } from "../api.js";
 
 GlobalWorkerOptions.workerSrc = workerSrc;
 
@@ -111,10 +112,55 @@ export default function PageReader({
   const [error, setError] = useState(null);
   const [canvasSize, setCanvasSize] = useState({ width: 0, height: 0 });
   const [textItems, setTextItems] = useState([]);
+  const [streamStats, setStreamStats] = useState({});
   const safeSelect = onSelectObject || (() => {});
 
   const currentPage = pages?.[pageIndex] || null;
 
+  // Text-op counts are computed server-side on first request per stream.
+  const contentStreams = useMemo(
+    () =>
+      (currentPage?.content_streams || []).map((stream) =>
+        stream.id && streamStats[stream.id] ? { ...stream, ...streamStats[stream.id] } : stream
+      ),
+    [currentPage, streamStats]
+  );
+
+  useEffect(() => {
+    setStreamStats({});
+  }, [pdfId]);
+
+  useEffect(() => {
+    if (!pdfId) {
+      return undefined;
+    }
+    const missing = (currentPage?.content_streams || [])
+      .map((stream) => stream.id)
+      .filter((id) => id && !(id in streamStats));
+    if (!missing.length) {
+      return undefined;
+    }
+
+    let cancelled = false;
+    Promise.all(missing.map((id) => getContentStreamStats(pdfId, id).catch(() => null))).then(
+      (results) => {
+        if (cancelled) {
+          return;
+        }
+        setStreamStats((prev) => {
+          const next = { ...prev };
+          missing.forEach((id, index) => {
+            next[id] = results[index] || { text_ops: null, unavailable: true };
+          });
+          return next;
+        });
+      }
+    );
+    return () => {
+      cancelled = true;
+    };
+  }, [pdfId, currentPage, streamStats]);
+
   useEffect(() => {
     if (!pdfId) {
       setDoc(null);
@@ -289,13 +335,19 @@ export default function PageReader({
       return { title, nodes };
     };
 
-    const contentEntries = (currentPage.content_streams || []).length
-      ? (currentPage.content_streams || [])
+    const contentEntries = contentStreams.length
+      ? contentStreams
           .filter((stream) => stream?.id)
           .map((stream) => ({
             id: stream.id,
             label: `Stream ${stream.id}`,
-            metaText: stream.text_ops ? `${stream.text_ops} text ops` : "no text ops",
+            metaText: stream.unavailable
+              ? "text ops unavailable"
+              : stream.text_ops == null
+                ? "counting text ops…"
+                : stream.text_ops
+                  ? `${stream.text_ops} text ops`
+                  : "no text ops",
           }))
       : (currentPage.contents || []).map((id) => ({
           id,
@@ -325,11 +377,11 @@ export default function PageReader({
       sections,
       truncated: limit.reached,
     };
-  }, [currentPage, graph]);
+  }, [currentPage, contentStreams, graph]);
 
   const streamTextMap = useMemo(() => {
     const map = new Map();
-    const streams = currentPage?.content_streams || [];
+    const streams = contentStreams;
     if (!streams.length || !textItems.length) {
       return map;
     }
@@ -363,14 +415,14 @@ export default function PageReader({
     });
 
     return map;
-  }, [currentPage, textItems]);
+  }, [contentStreams, textItems]);
 
   const selectedStream = useMemo(() => {
-    if (!selectedObjectId || !currentPage?.content_streams) {
+    if (!selectedObjectId || !contentStreams.length) {
       return null;
     }
-    return currentPage.content_streams.find((stream) => stream.id === selectedObjectId) || null;
-  }, [selectedObjectId, currentPage]);
+    return contentStreams.find((stream) => stream.id === selectedObjectId) || null;
+  }, [selectedObjectId, contentStreams]);
 
   const selectedNode = useMemo(() => {
     if (!selectedObjectId || !graph?.nodes?.length) {
@@ -28,3 +28,13 @@ CREATE INDEX IF NOT EXISTS idx_person_aliases_person_id
 
 CREATE INDEX IF NOT EXISTS idx_person_aliases_normalized_alias
   ON person_aliases(normalized_alias);
+
+-- Flattened (person, term) rows rebuilt by init_people_db.py so the app
+-- can load every name and alias with a single scan.
+CREATE TABLE IF NOT EXISTS people_terms (
+  id INTEGER PRIMARY KEY,
+  person_id INTEGER NOT NULL REFERENCES people(id) ON DELETE CASCADE,
+  name TEXT NOT NULL,
+  note TEXT,
+  term TEXT NOT NULL
+);
@@ -0,0 +1,141 @@
+import os
+import re
+import sqlite3
+import sys
+from bisect import bisect_right
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - falls back to RegexMatcher
+    ahocorasick = None
+
+TERM_CHARS = frozenset(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+)
+WHITESPACE_FOLD_RE = re.compile(r"[^\S ]\s*| \s+")
+
+
+@dataclass(frozen=True, slots=True)
+class Term:
+    person_id: int
+    name: str
+    note: str | None
+    term: str
+
+
+@lru_cache(maxsize=2)
+def load_people_terms(db_path: str):
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"Missing people database at {db_path}")
+    # The people DB is a build artifact: open it read-only and immutable so
+    # SQLite skips file locking and change detection.
+    db_uri = f"{Path(db_path).resolve().as_uri()}?mode=ro&immutable=1"
+    conn = sqlite3.connect(db_uri, uri=True)
+    try:
+        conn.execute("PRAGMA mmap_size=268435456")
+        rows = conn.execute(
+            "SELECT person_id, name, note, term FROM people_terms ORDER BY id"
+        ).fetchall()
+    finally:
+        conn.close()
+
+    terms = []
+    seen = set()
+    for person_id, person_name, person_note, term in rows:
+        if not term:
+            continue
+        cleaned = term.strip()
+        if not cleaned:
+            continue
+        key = (person_id, cleaned.lower())
+        if key in seen:
+            continue
+        seen.add(key)
+        # Interned so every alias of a person shares one name/note string.
+        terms.append(
+            Term(
+                person_id=int(person_id),
+                name=sys.intern(person_name),
+                note=sys.intern(person_note) if person_note else person_note,
+                term=cleaned,
+            )
+        )
+    return terms
+
+
+def fold_text(text: str):
+    """Lowercase text and collapse whitespace runs to a single space.
+
+    Returns the folded text plus (folded_starts, shifts) breakpoints used by
+    unfold_offset to map folded offsets back onto the original text.
+    """
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # A few characters lowercase to several code points; keep those as-is
+        # so folded offsets stay aligned with the original text.
+        lowered = "".join(ch if len(ch.lower()) != 1 else ch.lower() for ch in text)
+
+    pieces = []
+    folded_starts = []
+    shifts = []
+    shift = 0
+    last = 0
+    for match in WHITESPACE_FOLD_RE.finditer(lowered):
+        start, end = match.span()
+        pieces.append(lowered[last:start])
+        pieces.append(" ")
+        last = end
+        if end - start > 1:
+            shift += end - start - 1
+            folded_starts.append(end - shift)
+            shifts.append(shift)
+    if not pieces:
+        return lowered, folded_starts, shifts
+    pieces.append(lowered[last:])
+    return "".join(pieces), folded_starts, shifts
+
+
+def unfold_offset(offset: int, folded_starts, shifts) -> int:
+    idx = bisect_right(folded_starts, offset)
+    return offset + shifts[idx - 1] if idx else offset
+
+
+class RegexMatcher:
+    """Single-alternation stand-in for the Aho-Corasick automaton.
+
+    Used when pyahocorasick is unavailable. Exposes the same len()/iter()
+    interface; alternatives are tried longest first, so each scan yields the
+    leftmost-longest bounded hits that overlap resolution would keep anyway.
+    """
+
+    def __init__(self, entries):
+        keys = sorted(entries, key=len, reverse=True)
+        self.values = [(len(key), entries[key]) for key in keys]
+        alternation = "|".join(f"({re.escape(key)})" for key in keys)
+        self.pattern = re.compile(rf"(?<![a-z0-9])(?:{alternation})(?![a-z0-9])")
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def iter(self, text: str):
+        for match in self.pattern.finditer(text):
+            yield match.end() - 1, self.values[match.lastindex - 1]
+
+
+def build_people_automaton(db_path: str):
+    entries = {}
+    for term in load_people_terms(db_path):
+        entries.setdefault(fold_text(term.term)[0], []).append(term)
+
+    if ahocorasick is None:
+        return RegexMatcher(entries)
+
+    automaton = ahocorasick.Automaton()
+    for key, terms in entries.items():
+        automaton.add_word(key, (len(key), terms))
+    if len(automaton):
+        automaton.make_automaton()
+    return automaton